@@ -2,7 +2,6 @@ import click
 from pathlib import Path
 import logging
 import sys
-from .server import serve
 
 @click.command()
 @click.option("--repository", "-r", type=Path, help="Git repository path")
@@ -10,6 +9,8 @@ from .server import serve
 def main(repository: Path | None, verbose: bool) -> None:
     """MCP Git Server - Git functionality for MCP"""
     import asyncio
+    # Deferred so --help doesn't pay for importing GitPython, pydantic and the MCP SDK
+    from .server import serve
 
     logging_level = logging.WARN
     if verbose == 1:
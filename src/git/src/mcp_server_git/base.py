@@ -1,4 +1,23 @@
+import re
+import git
 from pydantic import BaseModel
 
 class GitBaseModel(BaseModel):
-    repo_path: str
\ No newline at end of file
+    repo_path: str
+
+# One pass over stderr classifies every git failure the tools know how to explain
+_GIT_ERROR_RE = re.compile(
+    r"(?P<bad_revision>fatal: bad revision|unknown revision or path not in the working tree)"
+    r"|(?P<no_upstream>no upstream branch)"
+    r"|(?P<no_tracking>There is no tracking information for the current branch)"
+)
+
+def git_error_kind(e: git.GitCommandError) -> str | None:
+    """Classify a failed git command by its stderr, or None if it is not a known failure"""
+    match = _GIT_ERROR_RE.search(str(e.stderr))
+    return match.lastgroup if match else None
+
+def object_db_git(repo: git.Repo) -> git.Git:
+    """Git runner for read-only commands that only need the object database"""
+    # Run from inside the git dir so git sets up no worktree to stat or lock
+    return git.Git(repo.git_dir)(no_optional_locks=True)
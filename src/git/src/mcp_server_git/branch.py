@@ -1,6 +1,7 @@
 import git
 from pydantic import Field
-from .base import GitBaseModel
+from .base import GitBaseModel, object_db_git
+from .cache import cached_log
 
 class GitLog(GitBaseModel):
     max_count: int = 10
@@ -13,17 +14,20 @@ class GitSwitch(GitBaseModel):
     branch_name: str
     create_branch: bool = Field(default=False, description="Create new branch if it doesn't exist (-c)")
 
+# git renders each entry itself; with -z, format: separates entries by NUL
+# Dates use git's strict ISO 8601 (%aI), e.g. 2024-01-31T09:15:00+01:00
+LOG_ENTRY_FORMAT = "--format=format:Commit: %H%nAuthor: %an%nDate: %aI%nMessage: %B%n"
+
 def git_log(repo: git.Repo, max_count: int = 10) -> list[str]:
-    commits = list(repo.iter_commits(max_count=max_count))
-    log = []
-    for commit in commits:
-        log.append(
-            f"Commit: {commit.hexsha}\n"
-            f"Author: {commit.author}\n"
-            f"Date: {commit.authored_datetime}\n"
-            f"Message: {commit.message}\n"
-        )
-    return log
+    # History below a given HEAD never changes, so the result can be reused until HEAD moves
+    return cached_log(repo, max_count, LOG_ENTRY_FORMAT, lambda: _read_log(repo, max_count))
+
+def _read_log(repo: git.Repo, max_count: int) -> list[str]:
+    # Splitting git's output is the only copy made; no per-commit objects or records
+    output = object_db_git(repo).log(
+        f"--max-count={max_count}", "-z", LOG_ENTRY_FORMAT, strip_newline_in_stdout=False
+    )
+    return output.split("\0") if output else []
 
 def git_create_branch(repo: git.Repo, branch_name: str, base_branch: str | None = None) -> str:
     if base_branch:
@@ -34,15 +38,28 @@ def git_create_branch(repo: git.Repo, branch_name: str, base_branch: str | None
     repo.create_head(branch_name, base)
     return f"Created branch '{branch_name}' from '{base.name}'"
 
-def git_switch(repo: git.Repo, branch_name: str, create_branch: bool = False) -> str:
+def _ref_exists(repo: git.Repo, ref: str) -> bool:
+    # The batch worker reads one name per line, so whitespace or control characters would
+    # desync it for every later call. No valid ref name contains them.
+    if any(c.isspace() or not c.isprintable() for c in ref):
+        return False
+    # Ask the repo's persistent `git cat-file --batch-check` worker rather than spawning rev-parse
     try:
-        if create_branch:
-            repo.git.switch(branch_name, c=True)
-            return f"Created and switched to new branch '{branch_name}'"
-        else:
-            repo.git.switch(branch_name)
-            return f"Switched to branch '{branch_name}'"
-    except git.GitCommandError as e:
-        if "did not match any file(s) known to git" in str(e):
-            return f"Branch '{branch_name}' does not exist. Use create_branch=True to create it."
-        raise
\ No newline at end of file
+        repo.git.get_object_header(ref)
+        return True
+    except ValueError:
+        return False
+
+def git_switch(repo: git.Repo, branch_name: str, create_branch: bool = False) -> str:
+    if create_branch:
+        repo.git.switch(branch_name, c=True)
+        return f"Created and switched to new branch '{branch_name}'"
+
+    # git switch also accepts a branch that only exists on a single remote and creates it locally
+    if not _ref_exists(repo, f"refs/heads/{branch_name}") and not any(
+        _ref_exists(repo, f"refs/remotes/{remote.name}/{branch_name}") for remote in repo.remotes
+    ):
+        return f"Branch '{branch_name}' does not exist. Use create_branch=True to create it."
+
+    repo.git.switch(branch_name)
+    return f"Switched to branch '{branch_name}'"
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+import git
+
+# Entries kept per repository before the least recently used ones are dropped
+MAX_ENTRIES = 64
+# Logs larger than this are cheaper to recompute than to store and parse
+MAX_ENTRY_BYTES = 256 * 1024
+
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mcp-git"
+
+def _repo_dir(repo: git.Repo) -> Path:
+    key = hashlib.sha256(os.path.realpath(repo.git_dir).encode()).hexdigest()
+    return _cache_dir() / key
+
+def _read(path: Path) -> list[str] | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            log = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(log, list):
+        return None
+    # Mark the entry as recently used without rewriting it; a read-only cache still serves hits
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return log
+
+def _write(path: Path, data: str) -> None:
+    # Write to a temporary file and rename so concurrent readers never see a partial file
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+def _evict(repo_dir: Path) -> None:
+    try:
+        entries = sorted(repo_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[:-MAX_ENTRIES]:
+            stale.unlink()
+    except OSError:
+        pass
+
+def cached_log(
+    repo: git.Repo, max_count: int, entry_format: str, compute: Callable[[], list[str]]
+) -> list[str]:
+    """Return the log for the current HEAD from disk, computing and storing it on a miss"""
+    # One file per (HEAD, max_count, format) so a lookup only reads the entry it returns,
+    # and entries written by a server with a different output format are never served
+    format_key = hashlib.sha256(entry_format.encode()).hexdigest()[:12]
+    repo_dir = _repo_dir(repo)
+    path = repo_dir / f"{repo.head.commit.hexsha}-{max_count}-{format_key}.json"
+
+    log = _read(path)
+    if log is not None:
+        return log
+
+    log = compute()
+    data = json.dumps(log)
+    if len(data) <= MAX_ENTRY_BYTES:
+        _write(path, data)
+        _evict(repo_dir)
+    return log
@@ -1,6 +1,10 @@
+import asyncio
+import json
 import logging
+import os
+from collections import OrderedDict
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Sequence
 from mcp.server import Server
 from mcp.server.session import ServerSession
 from mcp.server.stdio import stdio_server
@@ -13,6 +17,7 @@ from mcp.types import (
 )
 from enum import Enum
 import git
+from pydantic.json_schema import models_json_schema
 
 from .base import GitBaseModel
 from .setup import GitInit, git_init
@@ -25,14 +30,17 @@ from .branch import (
     git_log, git_create_branch, git_switch
 )
 from .sharing import (
-    GitFetch, GitPull, GitPush, GitRemoteAdd,
-    git_fetch, git_pull, git_push, git_remote_add
+    GitFetch, GitFetchAll, GitPull, GitPush, GitRemoteAdd,
+    git_fetch, git_fetch_all, git_pull, git_push, git_remote_add
 )
 
+logger = logging.getLogger(__name__)
+
 class GitTools(str, Enum):
     INIT = "git_init"
     DIFF = "git_diff"
     FETCH = "git_fetch"
+    FETCH_ALL = "git_fetch_all"
     PULL = "git_pull"
     PUSH = "git_push"
     REMOTE_ADD = "git_remote_add"
@@ -46,262 +54,270 @@ class GitTools(str, Enum):
     CREATE_BRANCH = "git_create_branch"
     SWITCH = "git_switch"
 
-async def serve(repository: Path | None) -> None:
-    logger = logging.getLogger(__name__)
-
-    if repository is not None:
-        try:
-            git.Repo(repository)
-            logger.info(f"Using repository at {repository}")
-        except git.InvalidGitRepositoryError:
-            logger.error(f"{repository} is not a valid Git repository")
-            return
-
-    server = Server("mcp-git")
+def _with_defs(schema: dict, defs: dict) -> dict:
+    # Each tool carries its own schema, so references into the shared $defs
+    # block only resolve if that block travels with the schema using them
+    if '"$ref"' not in json.dumps(schema):
+        return schema
+    return {**schema, "$defs": defs}
 
-    @server.list_tools()
-    async def list_tools() -> list[Tool]:
-        return [
-            Tool(
-                name=GitTools.INIT,
-                description="Initialize a new Git repository",
-                inputSchema=GitInit.schema(),
-            ),
-            Tool(
-                name=GitTools.DIFF,
-                description="Show changes between current HEAD and another branch/commit/tag",
-                inputSchema=GitDiff.schema(),
-            ),
-            Tool(
-                name=GitTools.FETCH,
-                description="Fetch refs and objects from another repository",
-                inputSchema=GitFetch.schema(),
-            ),
-            Tool(
-                name=GitTools.PULL,
-                description="Fetch and integrate with another repository or branch",
-                inputSchema=GitPull.schema(),
-            ),
-            Tool(
-                name=GitTools.PUSH,
-                description="Update remote refs along with associated objects",
-                inputSchema=GitPush.schema(),
-            ),
-            Tool(
-                name=GitTools.REMOTE_ADD,
-                description="Add a new remote repository",
-                inputSchema=GitRemoteAdd.schema(),
-            ),
-            Tool(
-                name=GitTools.STATUS,
-                description="Shows the working tree status",
-                inputSchema=GitStatus.schema(),
-            ),
-            Tool(
-                name=GitTools.DIFF_UNSTAGED,
-                description="Shows changes in the working directory that are not yet staged",
-                inputSchema=GitDiffUnstaged.schema(),
-            ),
-            Tool(
-                name=GitTools.DIFF_STAGED,
-                description="Shows changes that are staged for commit",
-                inputSchema=GitDiffStaged.schema(),
-            ),
-            Tool(
-                name=GitTools.COMMIT,
-                description="Records changes to the repository",
-                inputSchema=GitCommit.schema(),
-            ),
-            Tool(
-                name=GitTools.ADD,
-                description="Adds file contents to the staging area",
-                inputSchema=GitAdd.schema(),
-            ),
-            Tool(
-                name=GitTools.RESET,
-                description="Unstages all staged changes",
-                inputSchema=GitReset.schema(),
-            ),
-            Tool(
-                name=GitTools.LOG,
-                description="Shows the commit logs",
-                inputSchema=GitLog.schema(),
-            ),
-            Tool(
-                name=GitTools.CREATE_BRANCH,
-                description="Creates a new branch from an optional base branch",
-                inputSchema=GitCreateBranch.schema(),
-            ),
-            Tool(
-                name=GitTools.SWITCH,
-                description="Switch to another branch, optionally creating it with -c",
-                inputSchema=GitSwitch.schema(),
-            ),
-        ]
+# Generate all input schemas in one pass and give each tool a self-contained copy
+_, _SCHEMA_BUNDLE = models_json_schema([(model, "validation") for model in (
+    GitInit, GitDiff, GitFetch, GitFetchAll, GitPull, GitPush, GitRemoteAdd, GitStatus,
+    GitDiffUnstaged, GitDiffStaged, GitCommit, GitAdd, GitReset, GitLog, GitCreateBranch, GitSwitch,
+)])
+_SCHEMAS = {
+    name: _with_defs(schema, _SCHEMA_BUNDLE["$defs"])
+    for name, schema in _SCHEMA_BUNDLE["$defs"].items()
+}
 
-    async def list_repos() -> Sequence[str]:
-        async def by_roots() -> Sequence[str]:
-            if not isinstance(server.request_context.session, ServerSession):
-                raise TypeError("server.request_context.session must be a ServerSession")
+# Schemas are static, so build the tool list once at import time
+_TOOL_LIST = [
+    Tool(
+        name=GitTools.INIT,
+        description="Initialize a new Git repository",
+        inputSchema=_SCHEMAS["GitInit"],
+    ),
+    Tool(
+        name=GitTools.DIFF,
+        description="Show changes between current HEAD and another branch/commit/tag",
+        inputSchema=_SCHEMAS["GitDiff"],
+    ),
+    Tool(
+        name=GitTools.FETCH,
+        description="Fetch refs and objects from another repository",
+        inputSchema=_SCHEMAS["GitFetch"],
+    ),
+    Tool(
+        name=GitTools.FETCH_ALL,
+        description="Fetch from several remotes in parallel",
+        inputSchema=_SCHEMAS["GitFetchAll"],
+    ),
+    Tool(
+        name=GitTools.PULL,
+        description="Fetch and integrate with another repository or branch",
+        inputSchema=_SCHEMAS["GitPull"],
+    ),
+    Tool(
+        name=GitTools.PUSH,
+        description="Update remote refs along with associated objects",
+        inputSchema=_SCHEMAS["GitPush"],
+    ),
+    Tool(
+        name=GitTools.REMOTE_ADD,
+        description="Add a new remote repository",
+        inputSchema=_SCHEMAS["GitRemoteAdd"],
+    ),
+    Tool(
+        name=GitTools.STATUS,
+        description="Shows the working tree status",
+        inputSchema=_SCHEMAS["GitStatus"],
+    ),
+    Tool(
+        name=GitTools.DIFF_UNSTAGED,
+        description="Shows changes in the working directory that are not yet staged",
+        inputSchema=_SCHEMAS["GitDiffUnstaged"],
+    ),
+    Tool(
+        name=GitTools.DIFF_STAGED,
+        description="Shows changes that are staged for commit",
+        inputSchema=_SCHEMAS["GitDiffStaged"],
+    ),
+    Tool(
+        name=GitTools.COMMIT,
+        description="Records changes to the repository",
+        inputSchema=_SCHEMAS["GitCommit"],
+    ),
+    Tool(
+        name=GitTools.ADD,
+        description="Adds file contents to the staging area",
+        inputSchema=_SCHEMAS["GitAdd"],
+    ),
+    Tool(
+        name=GitTools.RESET,
+        description="Unstages all staged changes",
+        inputSchema=_SCHEMAS["GitReset"],
+    ),
+    Tool(
+        name=GitTools.LOG,
+        description="Shows the commit logs",
+        inputSchema=_SCHEMAS["GitLog"],
+    ),
+    Tool(
+        name=GitTools.CREATE_BRANCH,
+        description="Creates a new branch from an optional base branch",
+        inputSchema=_SCHEMAS["GitCreateBranch"],
+    ),
+    Tool(
+        name=GitTools.SWITCH,
+        description="Switch to another branch, optionally creating it with -c",
+        inputSchema=_SCHEMAS["GitSwitch"],
+    ),
+]
 
-            if not server.request_context.session.check_client_capability(
-                ClientCapabilities(roots=RootsCapability())
-            ):
-                return []
+# Input model and handler for every tool that operates on an existing repository,
+# keyed by tool name. Arguments are validated against the model before dispatch.
+_HANDLERS: dict[str, tuple[type[GitBaseModel], Callable[[git.Repo, Any], str]]] = {
+    GitTools.DIFF.value: (GitDiff, lambda repo, args: git_diff(repo, args.other)),
+    GitTools.FETCH.value: (GitFetch, lambda repo, args: git_fetch(repo, args.remote)),
+    GitTools.FETCH_ALL.value: (
+        GitFetchAll,
+        lambda repo, args: git_fetch_all(repo, args.remotes, args.jobs)
+    ),
+    GitTools.PULL.value: (GitPull, lambda repo, args: git_pull(repo, args.remote, args.branch)),
+    GitTools.PUSH.value: (
+        GitPush,
+        lambda repo, args: git_push(repo, args.remote, args.branch, args.set_upstream)
+    ),
+    GitTools.REMOTE_ADD.value: (
+        GitRemoteAdd,
+        lambda repo, args: git_remote_add(repo, args.name, args.url)
+    ),
+    GitTools.STATUS.value: (
+        GitStatus,
+        lambda repo, args: "Repository status:\n" + git_status(repo, args.untracked)
+    ),
+    GitTools.DIFF_UNSTAGED.value: (
+        GitDiffUnstaged,
+        lambda repo, args: "Unstaged changes:\n" + git_diff_unstaged(repo)
+    ),
+    GitTools.DIFF_STAGED.value: (
+        GitDiffStaged,
+        lambda repo, args: "Staged changes:\n" + git_diff_staged(repo)
+    ),
+    GitTools.COMMIT.value: (GitCommit, lambda repo, args: git_commit(repo, args.message)),
+    GitTools.ADD.value: (GitAdd, lambda repo, args: git_add(repo, args.files)),
+    GitTools.RESET.value: (GitReset, lambda repo, args: git_reset(repo)),
+    GitTools.LOG.value: (
+        GitLog,
+        lambda repo, args: "Commit history:\n" + "\n".join(git_log(repo, args.max_count))
+    ),
+    GitTools.CREATE_BRANCH.value: (
+        GitCreateBranch,
+        lambda repo, args: git_create_branch(repo, args.branch_name, args.base_branch)
+    ),
+    GitTools.SWITCH.value: (
+        GitSwitch,
+        lambda repo, args: git_switch(repo, args.branch_name, args.create_branch)
+    ),
+}
 
-            roots_result: ListRootsResult = await server.request_context.session.list_roots()
-            logger.debug(f"Roots result: {roots_result}")
-            repo_paths = []
-            for root in roots_result.roots:
-                path = root.uri.path
-                try:
-                    git.Repo(path)
-                    repo_paths.append(str(path))
-                except git.InvalidGitRepositoryError:
-                    pass
-            return repo_paths
+# Open Repo handles by resolved path, with the (st_dev, st_ino) of their git dir at open time
+_REPO_CACHE: OrderedDict[str, tuple[git.Repo, tuple[int, int]]] = OrderedDict()
+_REPO_CACHE_SIZE = 32
 
-        def by_commandline() -> Sequence[str]:
-            return [str(repository)] if repository is not None else []
+def _git_dir_id(repo: git.Repo) -> tuple[int, int]:
+    st = os.stat(repo.git_dir)
+    return st.st_dev, st.st_ino
 
-        cmd_repos = by_commandline()
-        root_repos = await by_roots()
-        return [*root_repos, *cmd_repos]
+def _evict_repo(path: str) -> None:
+    entry = _REPO_CACHE.pop(path, None)
+    if entry is not None:
+        # Stops the handle's persistent cat-file workers
+        entry[0].close()
 
-    @server.call_tool()
-    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-        repo_path = Path(arguments["repo_path"])
-        
-        # Special handling for git init since it doesn't require an existing repo
-        if name == GitTools.INIT:
-            result = git_init(repo_path)
-            return [TextContent(
-                type="text",
-                text=result
-            )]
-        
-        # For all other commands, we need an existing repo
-        repo = git.Repo(repo_path)
-
-        match name:
-            case GitTools.DIFF:
-                diff = git_diff(repo, arguments["other"])
-                return [TextContent(
-                    type="text",
-                    text=diff
-                )]
+def _get_repo(path: str) -> git.Repo:
+    entry = _REPO_CACHE.get(path)
+    if entry is not None:
+        repo, git_dir_id = entry
+        # A repository deleted or re-created at the same path gets a new git dir
+        try:
+            if _git_dir_id(repo) == git_dir_id:
+                _REPO_CACHE.move_to_end(path)
+                return repo
+        except OSError:
+            pass
+        _evict_repo(path)
 
-            case GitTools.FETCH:
-                result = git_fetch(repo, arguments.get("remote", "origin"))
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+    repo = git.Repo(path)
+    _REPO_CACHE[path] = (repo, _git_dir_id(repo))
+    while len(_REPO_CACHE) > _REPO_CACHE_SIZE:
+        _evict_repo(next(iter(_REPO_CACHE)))
+    return repo
 
-            case GitTools.PULL:
-                result = git_pull(
-                    repo,
-                    arguments.get("remote", "origin"),
-                    arguments.get("branch")
-                )
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+def _validate_repo(path: str) -> str | None:
+    try:
+        git.Repo(path)
+        return str(path)
+    except git.InvalidGitRepositoryError:
+        return None
 
-            case GitTools.PUSH:
-                result = git_push(
-                    repo,
-                    arguments.get("remote", "origin"),
-                    arguments.get("branch"),
-                    arguments.get("set_upstream", False)
-                )
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+_server = Server("mcp-git")
 
-            case GitTools.REMOTE_ADD:
-                result = git_remote_add(repo, arguments["name"], arguments["url"])
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+@_server.list_tools()
+async def list_tools() -> list[Tool]:
+    return _TOOL_LIST
 
-            case GitTools.STATUS:
-                status = git_status(repo)
-                return [TextContent(
-                    type="text",
-                    text=f"Repository status:\n{status}"
-                )]
+async def list_repos(repository: Path | None) -> Sequence[str]:
+    async def by_roots() -> Sequence[str]:
+        if not isinstance(_server.request_context.session, ServerSession):
+            raise TypeError("server.request_context.session must be a ServerSession")
 
-            case GitTools.DIFF_UNSTAGED:
-                diff = git_diff_unstaged(repo)
-                return [TextContent(
-                    type="text",
-                    text=f"Unstaged changes:\n{diff}"
-                )]
+        if not _server.request_context.session.check_client_capability(
+            ClientCapabilities(roots=RootsCapability())
+        ):
+            return []
 
-            case GitTools.DIFF_STAGED:
-                diff = git_diff_staged(repo)
-                return [TextContent(
-                    type="text",
-                    text=f"Staged changes:\n{diff}"
-                )]
+        roots_result: ListRootsResult = await _server.request_context.session.list_roots()
+        logger.debug(f"Roots result: {roots_result}")
+        # Each check is blocking disk I/O, so run them concurrently off the event loop
+        repo_paths = await asyncio.gather(
+            *(
+                asyncio.to_thread(_validate_repo, root.uri.path)
+                for root in roots_result.roots
+                if root.uri.path is not None
+            )
+        )
+        return [path for path in repo_paths if path is not None]
 
-            case GitTools.COMMIT:
-                result = git_commit(repo, arguments["message"])
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+    def by_commandline() -> Sequence[str]:
+        return [str(repository)] if repository is not None else []
 
-            case GitTools.ADD:
-                result = git_add(repo, arguments["files"])
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+    cmd_repos = by_commandline()
+    root_repos = await by_roots()
+    return [*root_repos, *cmd_repos]
 
-            case GitTools.RESET:
-                result = git_reset(repo)
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+@_server.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    # Special handling for git init since it doesn't require an existing repo
+    if name == GitTools.INIT:
+        repo_path = Path(GitInit.model_validate(arguments).repo_path)
+        result = git_init(repo_path)
+        # Drop any cached handle so a re-initialized repository is picked up fresh
+        _evict_repo(str(repo_path.resolve()))
+        return [TextContent(
+            type="text",
+            text=result
+        )]
 
-            case GitTools.LOG:
-                log = git_log(repo, arguments.get("max_count", 10))
-                return [TextContent(
-                    type="text",
-                    text="Commit history:\n" + "\n".join(log)
-                )]
+    if name not in _HANDLERS:
+        raise ValueError(f"Unknown tool: {name}")
+    model, handler = _HANDLERS[name]
+    args = model.model_validate(arguments)
 
-            case GitTools.CREATE_BRANCH:
-                result = git_create_branch(
-                    repo,
-                    arguments["branch_name"],
-                    arguments.get("base_branch")
-                )
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
-                
-            case GitTools.SWITCH:
-                result = git_switch(
-                    repo,
-                    arguments["branch_name"],
-                    arguments.get("create_branch", False)
-                )
-                return [TextContent(
-                    type="text",
-                    text=result
-                )]
+    # For all other commands, we need an existing repo
+    repo_path = str(Path(args.repo_path).resolve())
+    repo = _get_repo(repo_path)
+    try:
+        result = handler(repo, args)
+    except (git.GitCommandError, ValueError):
+        # The cached handle may be what failed (e.g. a replaced object database), so reopen next time
+        _evict_repo(repo_path)
+        raise
+    return [TextContent(
+        type="text",
+        text=result
+    )]
 
-            case _:
-                raise ValueError(f"Unknown tool: {name}")
+async def serve(repository: Path | None) -> None:
+    if repository is not None:
+        try:
+            git.Repo(repository)
+            logger.info(f"Using repository at {repository}")
+        except git.InvalidGitRepositoryError:
+            logger.error(f"{repository} is not a valid Git repository")
+            return
 
-    options = server.create_initialization_options()
+    options = _server.create_initialization_options()
     async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
\ No newline at end of file
+        await _server.run(read_stream, write_stream, options, raise_exceptions=True)
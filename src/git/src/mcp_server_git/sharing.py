@@ -1,10 +1,14 @@
-from pydantic import BaseModel, Field
+from pydantic import Field
 import git
-from .base import GitBaseModel
+from .base import GitBaseModel, git_error_kind
 
 class GitFetch(GitBaseModel):
     remote: str = Field(default="origin", description="Remote name to fetch from")
 
+class GitFetchAll(GitBaseModel):
+    remotes: list[str] | None = Field(default=None, description="Remotes to fetch from (default: all remotes)")
+    jobs: int = Field(default=8, ge=1, description="Number of remotes to fetch in parallel")
+
 class GitPull(GitBaseModel):
     remote: str = Field(default="origin", description="Remote to pull from")
     branch: str | None = Field(default=None, description="Branch to pull (default: current branch)")
@@ -21,9 +25,23 @@ class GitRemoteAdd(GitBaseModel):
 def git_fetch(repo: git.Repo, remote: str = "origin") -> str:
     origin = repo.remotes[remote]
     fetch_info = origin.fetch()
-    if not fetch_info:
+    # Only report refs that actually moved; unchanged ones are the common case
+    updated = [info for info in fetch_info if not info.flags & info.HEAD_UPTODATE]
+    if not updated:
         return f"No updates from {remote}"
-    return "\n".join(str(info) for info in fetch_info)
+    return "\n".join(str(info) for info in updated)
+
+def git_fetch_all(repo: git.Repo, remotes: list[str] | None = None, jobs: int = 8) -> str:
+    # Resolve names like git_fetch does, so only configured remotes reach the command line
+    names = ["--", *(repo.remotes[remote].name for remote in remotes)] if remotes else ["--all"]
+    _, _, progress = repo.git.fetch(
+        "--jobs", str(jobs), "--multiple", *names,
+        with_extended_output=True
+    )
+    # git reports updated refs on stderr and only the remote names on stdout
+    if not progress:
+        return f"No updates from {', '.join(remotes) if remotes else 'any remote'}"
+    return progress
 
 def git_pull(repo: git.Repo, remote: str = "origin", branch: str | None = None) -> str:
     try:
@@ -36,7 +54,7 @@ def git_pull(repo: git.Repo, remote: str = "origin", branch: str | None = None)
             return f"Already up to date with {remote}"
         return "\n".join(str(info) for info in pull_info)
     except git.GitCommandError as e:
-        if "There is no tracking information for the current branch" in str(e):
+        if git_error_kind(e) == "no_tracking":
             return "No tracking information for current branch. Use --set-upstream to configure tracking."
         raise
 
@@ -49,7 +67,7 @@ def git_push(repo: git.Repo, remote: str = "origin", branch: str | None = None,
             return repo.git.push(remote, branch)
         return repo.git.push()
     except git.GitCommandError as e:
-        if "no upstream branch" in str(e):
+        if git_error_kind(e) == "no_upstream":
             return f"Current branch has no upstream branch. Use --set-upstream to configure tracking."
         raise
 
@@ -1,12 +1,19 @@
+import errno
+import os
+import tempfile
+from typing import Literal
 import git
 from pydantic import Field
-from .base import GitBaseModel
+from .base import GitBaseModel, git_error_kind, object_db_git
 
 class GitDiff(GitBaseModel):
     other: str = Field(description="The branch/commit/tag to compare against")
 
 class GitStatus(GitBaseModel):
-    pass
+    untracked: Literal["no", "normal", "all"] = Field(
+        default="normal",
+        description="How to show untracked files (--untracked-files)"
+    )
 
 class GitDiffUnstaged(GitBaseModel):
     pass
@@ -23,30 +30,54 @@ class GitAdd(GitBaseModel):
 class GitReset(GitBaseModel):
     pass
 
+# Below this many files the in-process index update beats spawning git
+BULK_ADD_THRESHOLD = 16
+
+def _output(raw: bytes) -> str:
+    # Decode raw git output once; replacement keeps non-UTF-8 content JSON-safe
+    return raw.decode("utf-8", errors="replace")
+
 def git_diff(repo: git.Repo, other: str) -> str:
     """Compare current HEAD with another branch/commit/tag"""
     try:
-        return repo.git.diff("HEAD", other)
+        return _output(object_db_git(repo).diff("HEAD", other, stdout_as_string=False))
     except git.GitCommandError as e:
-        if "fatal: bad revision" in str(e):
+        if git_error_kind(e) == "bad_revision":
             return f"Invalid revision '{other}'"
         raise
 
-def git_status(repo: git.Repo) -> str:
-    return repo.git.status()
+def git_status(repo: git.Repo, untracked: str = "normal") -> str:
+    # Read-only, so don't take the index lock just to refresh stat info
+    return _output(repo.git(no_optional_locks=True).status(
+        f"--untracked-files={untracked}", stdout_as_string=False
+    ))
 
 def git_diff_unstaged(repo: git.Repo) -> str:
-    return repo.git.diff()
+    return _output(repo.git.diff(stdout_as_string=False))
 
 def git_diff_staged(repo: git.Repo) -> str:
-    return repo.git.diff("--cached")
+    return _output(repo.git.diff("--cached", stdout_as_string=False))
 
 def git_commit(repo: git.Repo, message: str) -> str:
     commit = repo.index.commit(message)
     return f"Changes committed successfully with hash {commit.hexsha}"
 
 def git_add(repo: git.Repo, files: list[str]) -> str:
-    repo.index.add(files)
+    if len(files) < BULK_ADD_THRESHOLD:
+        repo.index.add(files)
+    else:
+        # Like repo.index.add, refuse paths missing from the worktree instead of staging deletions
+        for file in files:
+            if not os.path.lexists(os.path.join(repo.working_dir, file)):
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), file)
+        # Hand the whole list to a single `git add` so the index is written once
+        with tempfile.TemporaryFile() as pathspec:
+            pathspec.write("\0".join(files).encode())
+            pathspec.seek(0)
+            # Match repo.index.add: take names literally and stage ignored files too
+            repo.git(literal_pathspecs=True).add(
+                "--force", "--pathspec-from-file=-", "--pathspec-file-nul", istream=pathspec
+            )
     return "Files staged successfully"
 
 def git_reset(repo: git.Repo) -> str: